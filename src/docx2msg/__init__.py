@@ -27,30 +27,149 @@ with Docx2Msg(docx_path) as docx:
 __version__ = "0.1.2"
 
 import base64
+import copy
+import mmap
+import os
+import sys
 import warnings
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any, Dict, Literal, Optional, Union
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import win32com.client
 import yaml
-from bs4 import BeautifulSoup
-from docx import Document
 from docxtpl import DocxTemplate
+from lxml import etree
+from lxml import html as lhtml
 
+from .docx_parts import body_is_empty, package_fingerprint, read_header_text
 from .mail_props import *
 
+try:
+    # LibYAML's C scanner, when PyYAML was built with it
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+def _load_yaml(text: str) -> Any:
+    return yaml.load(text, Loader=_SafeLoader)
+
+
+def _b64encode_file(path: Path) -> bytes:
+    """Base64 encode a file through a read-only mmap instead of reading it into memory."""
+    with open(path, "rb") as f:
+        if not path.stat().st_size:
+            # an empty file can't be mmapped
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm)
+
+
+def _img_data_uri(img_path: Path) -> str:
+    ext = img_path.suffix.lstrip(".")
+    uri = b"data:image/" + ext.encode() + b";base64," + _b64encode_file(img_path)
+    return uri.decode("ascii")
+
+
+_EMPTY_HTML = "<html><body></body></html>"
+
+# HTMLBody shared by all instances, keyed by (package fingerprint, backend)
+_HTML_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_HTML_CACHE_SIZE = 128
+# total length of the cached HTMLBody, which inlines the images as base64
+_HTML_CACHE_MAX_CHARS = 64 * 1024 * 1024
+_HTML_CACHE_CHARS = 0
+_HTML_CACHE_LOCK = Lock()
+
+
+def clear_html_cache() -> None:
+    """Drop the HTMLBody cached for the converted docx."""
+    global _HTML_CACHE_CHARS
+    with _HTML_CACHE_LOCK:
+        _HTML_CACHE.clear()
+        _HTML_CACHE_CHARS = 0
+
+
+def _get_cached_html(key: Tuple[str, str]) -> Optional[str]:
+    with _HTML_CACHE_LOCK:
+        html = _HTML_CACHE.get(key)
+        if html is not None:
+            _HTML_CACHE.move_to_end(key)
+    return html
+
+
+def _cached_html(key: Tuple[str, str], convert: Callable[[], str]) -> str:
+    """Return the cached HTMLBody of `key`, or convert and cache it on a miss."""
+    html = _get_cached_html(key)
+    if html is not None:
+        return html
+    global _HTML_CACHE_CHARS
+    html = convert()
+    if len(html) > _HTML_CACHE_MAX_CHARS:
+        return html
+    with _HTML_CACHE_LOCK:
+        old = _HTML_CACHE.pop(key, None)
+        if old is not None:
+            _HTML_CACHE_CHARS -= len(old)
+        _HTML_CACHE[key] = html
+        _HTML_CACHE_CHARS += len(html)
+        while (
+            len(_HTML_CACHE) > _HTML_CACHE_SIZE
+            or _HTML_CACHE_CHARS > _HTML_CACHE_MAX_CHARS
+        ):
+            _, evicted = _HTML_CACHE.popitem(last=False)
+            _HTML_CACHE_CHARS -= len(evicted)
+    return html
+
+
+def _template_changed(template: DocxTemplate) -> bool:
+    """Return whether saving the template would differ from the docx it was loaded from."""
+    # docxtpl also applies the replacements of pictures, media, embedded files and
+    # zip entries on save, without a render
+    return template.is_rendered or any(
+        (
+            template.pics_to_replace,
+            template.crc_to_new_media,
+            template.crc_to_new_embedded,
+            template.zipname_to_replace,
+        )
+    )
+
 
 class Docx2Msg:
     """Class for converting a docx to an Outlook Mail-Item."""
 
-    def __init__(self, docx: Union[str, Path]) -> None:
+    def __init__(
+        self,
+        docx: Union[str, Path],
+        outlook: Optional[win32com.client.CDispatch] = None,
+        word: Optional[win32com.client.CDispatch] = None,
+    ) -> None:
         """Class for converting a docx to an Outlook Mail-Item.
 
         Parameters
         ----------
         docx : Union[str, Path]
             The path of the docx file.
+        outlook : Optional[CDispatch] (default None)
+            The Outlook Application to create Mail-Items by. If None, dispatch a new one.
+        word : Optional[CDispatch] (default None)
+            The Word Application to export the docx by. If None, dispatch a new one.
 
         References
         ----------
@@ -61,13 +180,22 @@ class Docx2Msg:
         """
         self.original_docx_path = Path(docx)
         self.docx_path = Path(docx)
-        self.outlook = win32com.client.Dispatch("Outlook.Application")
-        self.word = win32com.client.Dispatch("Word.Application")
-        self.word.Visible = True
-        self.word.DisplayAlerts = 0
+        if outlook is None:
+            outlook = win32com.client.Dispatch("Outlook.Application")
+        self.outlook = outlook
+        if word is None:
+            word = win32com.client.Dispatch("Word.Application")
+            word.Visible = True
+            word.DisplayAlerts = 0
+        self.word = word
         self.__headers: Dict[str, Any] = None
         self.__docx_template: DocxTemplate = None
         self.__temp_dir: TemporaryDirectory = None
+        self.__headers_cache: Optional[Dict[str, Any]] = None
+        self.__html_cache: Dict[str, str] = {}
+        self.__cache_key: Optional[Tuple[Path, int, int]] = None
+        # SaveSentMessageFolder folders resolved by self.outlook, by path
+        self.__folders: Dict[str, Any] = {}
 
     def __enter__(self):
         self.temp_dir
@@ -87,20 +215,47 @@ class Docx2Msg:
     def template(self) -> DocxTemplate:
         """Return the instance of DocxTemplate."""
         if not self.__docx_template:
-            self.__docx_template = DocxTemplate(self.docx_path)
+            self.__docx_template = DocxTemplate(self.original_docx_path)
         return self.__docx_template
 
     def __template_save(self):
-        if self.__docx_template:
+        template = self.__docx_template
+        # render() resets is_saved, so a template is saved again once re-rendered
+        if template and not template.is_saved and _template_changed(template):
+            self.__clear_cache()
             self.docx_path = self.temp_dir / "temp.docx"
-            self.template.save(self.docx_path)
+            template.save(self.docx_path)
+            # don't hold the parsed docx once saved, docxtpl reloads it on render
+            template.docx = None
+
+    def __clear_cache(self) -> None:
+        self.__headers_cache = None
+        self.__html_cache = {}
+        self.__cache_key = None
+
+    def __check_cache(self) -> None:
+        """Drop the cached headers and HTML if the docx has changed since they were extracted."""
+        stat = self.docx_path.stat()
+        key = (self.docx_path, stat.st_mtime_ns, stat.st_size)
+        if key != self.__cache_key:
+            self.__clear_cache()
+            self.__cache_key = key
 
     def __extract_headers(self) -> Optional[Dict[str, Any]]:
-        doc = Document(self.docx_path)
+        self.__check_cache()
+        if self.__headers_cache is None:
+            self.__headers_cache = self.__parse_headers()
+        return self.__headers_cache
+
+    def __parse_headers(self) -> Optional[Dict[str, Any]]:
         # get header of the first section of the document
-        header = doc.sections[0].header
-        header_text = "\n".join(p.text for p in header.paragraphs)
-        attrs = yaml.safe_load(header_text)
+        header_text = read_header_text(self.docx_path)
+        attrs = _load_yaml(header_text)
+        if isinstance(attrs, Dict):
+            # interned keys hit the identity fast path in SET_SUPPORTED_PROPERTIES
+            attrs = {
+                sys.intern(k) if type(k) is str else k: v for k, v in attrs.items()
+            }
         return attrs
 
     @property
@@ -109,13 +264,14 @@ class Docx2Msg:
         if self.__headers:
             return self.__headers
         self.__template_save()
-        return self.__extract_headers()
+        # a copy, so changing it doesn't change the cached headers convert() sets
+        return copy.deepcopy(self.__extract_headers())
 
     @headers.setter
     def headers(self, value: Union[str, Dict[str, Any]]) -> None:
         """Set mail properties from a Dict."""
         if isinstance(value, str):
-            value = yaml.safe_load(value)
+            value = _load_yaml(value)
         if isinstance(value, Dict):
             self.__headers = value
         else:
@@ -138,14 +294,93 @@ class Docx2Msg:
         self.headers = context
         return context
 
-    def __extract_html(self) -> str:
-        docx = self.word.Documents.Open(str(self.docx_path))
-        docx.SaveEncoding = 65001
+    def __extract_html(self, backend: Literal["word", "mammoth"] = "word") -> str:
+        if backend == "word":
+            convert = self.__export_html
+        elif backend == "mammoth":
+            convert = self.__convert_html_by_mammoth
+        else:
+            raise ValueError('The backend must be "word" or "mammoth".')
+        self.__check_cache()
+        if backend not in self.__html_cache:
+            if body_is_empty(self.docx_path):
+                # e.g. a docx only for the mail properties, no need to launch Word
+                self.__html_cache[backend] = _EMPTY_HTML
+            else:
+                key = self.__html_key(backend)
+                self.__html_cache[backend] = _cached_html(key, convert)
+        return self.__html_cache[backend]
+
+    def __html_key(self, backend: str) -> Tuple[str, str]:
+        return package_fingerprint(self.docx_path), backend
+
+    def __known_word_html(self) -> Optional[str]:
+        """Return the HTML of the word backend if it's known without launching Word."""
+        if body_is_empty(self.docx_path):
+            return _EMPTY_HTML
+        return _get_cached_html(self.__html_key("word"))
+
+    def __export_html(self) -> str:
+        return self.__read_html(self.__save_as_html())
+
+    def __save_as_html(self) -> Path:
+        """Export the docx to HTML by Word and return the path of the HTML."""
+        # the docx is only exported, so open it read-only in the background
+        docx = self.word.Documents.Open(
+            str(self.docx_path), ReadOnly=True, AddToRecentFiles=False, Visible=False
+        )
         html_path = self.temp_dir / "temp.html"
-        docx.SaveAs2(str(html_path), FileFormat=10, Encoding=65001)
-        docx.Close()
-        html = html_path.read_text(encoding="utf-8")
-        return self.__revise_html(html)
+        try:
+            docx.SaveAs2(str(html_path), FileFormat=10, Encoding=65001)
+        finally:
+            docx.Close(SaveChanges=0)
+        return html_path
+
+    def __read_html(self, html_path: Path) -> str:
+        # parse the file directly instead of reading it into a str first,
+        # and a parser per call since lxml parsers can't be shared by threads
+        with open(html_path, "rb") as f:
+            # libxml2 adds a HTML 4.0 DOCTYPE to a document without one,
+            # so check whether Word wrote one itself
+            prolog = f.read(4096).lower().split(b"<html", 1)[0]
+            f.seek(0)
+            tree = lhtml.parse(f, lhtml.HTMLParser(encoding="utf-8"))
+        doctype = tree.docinfo.doctype if b"<!doctype" in prolog else None
+        return self.__revise_html(tree, doctype)
+
+    def __prefetch(
+        self,
+        backend: Literal["word", "mammoth"],
+        html: Optional[str] = None,
+        html_path: Optional[Path] = None,
+    ) -> None:
+        """Fill the cache of the headers and HTML in a worker thread.
+
+        It never reaches Word: for the word backend, the calling thread passes either
+        the `html` it already knows or the `html_path` it exported by Word.
+        """
+        self.__extract_headers()
+        if backend != "word":
+            self.__extract_html(backend)
+            return
+        self.__check_cache()
+        if html is None:
+            html = _cached_html(
+                self.__html_key(backend), lambda: self.__read_html(html_path)
+            )
+        self.__html_cache[backend] = html
+
+    def __convert_html_by_mammoth(self) -> str:
+        """Convert the docx to HTML with mammoth, without launching Word."""
+        try:
+            import mammoth
+        except ImportError:
+            raise ImportError(
+                'The "mammoth" backend requires mammoth, install it by `pip install docx2msg[mammoth]`.'
+            )
+        with open(self.docx_path, "rb") as f:
+            # images are already embedded as base64 data URIs by mammoth
+            return mammoth.convert_to_html(f).value
 
     @property
     def html(self) -> str:
@@ -153,21 +388,35 @@ class Docx2Msg:
         self.__template_save()
         return self.__extract_html()
 
-    def __revise_html(self, html: str) -> str:
+    def __revise_html(
+        self, tree: etree._ElementTree, doctype: Optional[str] = None
+    ) -> str:
         """Revise the HTMLBody of the docx."""
-        soup = BeautifulSoup(html, "html.parser")
-        self.__base64_img(soup)
-        return str(soup)
+        self.__base64_img(tree)
+        # keep the markup as Word exported it: its meta charset, and its DOCTYPE if any
+        if doctype is None:
+            return lhtml.tostring(
+                tree.getroot(), encoding="unicode", include_meta_content_type=True
+            )
+        return lhtml.tostring(
+            tree, encoding="unicode", include_meta_content_type=True, doctype=doctype
+        )
 
-    def __base64_img(self, soup: BeautifulSoup) -> None:
+    def __base64_img(self, tree: etree._ElementTree) -> None:
         """Convert the img src to base64."""
-        for img in soup.find_all("img"):
-            img_path: Path = self.temp_dir / img["src"]
-            ext = img_path.suffix.lstrip(".")
+        imgs = []
+        for img in tree.xpath("//img[@src]"):
+            img_path: Path = self.temp_dir / img.get("src")
             if img_path.exists():
-                with open(img_path, "rb") as f:
-                    img_data = base64.b64encode(f.read()).decode()
-                img["src"] = f"data:image/{ext};base64,{img_data}"
+                imgs.append((img, img_path))
+        if not imgs:
+            return
+        # reading and base64 encoding release the GIL, so encode the images in parallel
+        img_paths = list(dict.fromkeys(img_path for _, img_path in imgs))
+        with ThreadPoolExecutor(min(len(img_paths), os.cpu_count() or 1)) as executor:
+            uris = dict(zip(img_paths, executor.map(_img_data_uri, img_paths)))
+        for img, img_path in imgs:
+            img.set("src", uris[img_path])
 
     def convert(
         self,
@@ -175,6 +424,7 @@ class Docx2Msg:
         reply_mode: Literal["Reply", "ReplyAll"] = "Reply",
         display=False,
         force_render=False,
+        backend: Literal["word", "mammoth"] = "word",
     ) -> "_MailItem":
         """
         Convert the docx(or docx template) to an Outlook Mail-Item.
@@ -189,6 +439,8 @@ class Docx2Msg:
             Whether to display the created Mail-Item.
         force_render : bool (default False)
             Whether to force render the HTMLBody of the Mail-Item by saving the Mail-Item in the default draft folder in Outlook.
+        backend : Literal['word', 'mammoth'] (default 'word')
+            The converter of the docx body to HTMLBody. 'word' exports the HTML by Word Application, 'mammoth' converts the docx by the `mammoth` package without launching Word, which is much faster but keeps less of the docx formatting.
 
         Returns
         -------
@@ -199,6 +451,8 @@ class Docx2Msg:
         ------
         AttributeError
             If the mail property is not supported by the Mail-Item in Outlook.
+        ImportError
+            If `backend` is 'mammoth' but the `mammoth` package is not installed.
 
         Notes
         -----
@@ -224,8 +478,9 @@ class Docx2Msg:
         # set mail attributes
         headers = self.__extract_headers()
         for k, v in headers.items():
-            if k in SET_SUPPORTED_PROPERTIES:
-                SET_SUPPORTED_PROPERTIES[k](self.mail, v, outlook=self.outlook)
+            set_attr = SET_SUPPORTED_PROPERTIES.get(k)
+            if set_attr is not None:
+                set_attr(self.mail, v, outlook=self.outlook, folders=self.__folders)
             else:
                 warnings.warn(
                     f"""The mail property "{k}" is not guaranteed to be set correctly, which may cause unexpected behavior or error.
@@ -239,10 +494,11 @@ class Docx2Msg:
                 setattr(self.mail, k, v)
         # set mail body
         if reply_on is None:
-            self.mail.HTMLBody = self.__extract_html()
+            self.mail.HTMLBody = self.__extract_html(backend)
         else:
             # when reply a mail, add new body before the original body
-            self.mail.HTMLBody = self.__extract_html() + "\n" + self.mail.HTMLBody
+            html = self.__extract_html(backend)
+            self.mail.HTMLBody = html + "\n" + self.mail.HTMLBody
 
         if display:
             self.mail.Display()
@@ -252,3 +508,79 @@ class Docx2Msg:
                 "The Mail-Item has been saved in the default draft folder in Outlook in order to well render the HTMLBody."
             )
         return self.mail
+
+    @classmethod
+    def convert_many(
+        cls,
+        docxs: Iterable[Union[str, Path]],
+        max_workers: int = 4,
+        outlook: Optional[win32com.client.CDispatch] = None,
+        word: Optional[win32com.client.CDispatch] = None,
+        **kwargs,
+    ) -> List["_MailItem"]:
+        """
+        Convert many docx to Outlook Mail-Items by one Word and one Outlook Application.
+
+        Word exports the docx one by one, while the headers and the exported HTML of
+        the previous docx are parsed in a thread pool in the meantime.
+
+        Parameters
+        ----------
+        docxs : Iterable[Union[str, Path]]
+            The paths of the docx files.
+        max_workers : int (default 4)
+            The max number of threads to parse the headers and HTML.
+        outlook : Optional[CDispatch] (default None)
+            The Outlook Application to create Mail-Items by. If None, dispatch a new one.
+        word : Optional[CDispatch] (default None)
+            The Word Application to export the docx by. If None, dispatch a new one.
+        **kwargs
+            The other parameters passed to `convert`, e.g. `display` and `backend`.
+
+        Returns
+        -------
+        mails : List[_MailItem]
+            The converted Outlook Mail-Items, in the order of `docxs`.
+
+        Notes
+        -----
+        - COM objects are only used in the calling thread, since Word and Outlook are single-threaded apartments.
+        - Each docx is converted as soon as its job is done and the jobs before it are converted, and its temporary files are removed right after, so they don't pile up until the whole batch is finished.
+        """
+        backend = kwargs.get("backend", "word")
+        folders: Dict[str, Any] = {}
+        pending: Deque[Tuple["Docx2Msg", Future]] = deque()
+        mails = []
+
+        def convert_done(wait: bool) -> None:
+            # convert in order, closing each docx once its mail is created
+            while pending and (wait or pending[0][1].done()):
+                doc, job = pending.popleft()
+                with doc:
+                    job.result()
+                    mails.append(doc.convert(**kwargs))
+
+        try:
+            with ThreadPoolExecutor(max_workers) as executor:
+                for docx in docxs:
+                    doc = cls(docx, outlook=outlook, word=word).__enter__()
+                    pending.append((doc, None))
+                    outlook, word = doc.outlook, doc.word
+                    # the folders resolved by the shared outlook are valid for all docx
+                    doc.__folders = folders
+                    html = html_path = None
+                    if backend == "word":
+                        # decided here, so a worker never drives Word, e.g. after the
+                        # cached HTML is evicted by the other workers
+                        html = doc.__known_word_html()
+                        if html is None:
+                            html_path = doc.__save_as_html()
+                    job = executor.submit(doc.__prefetch, backend, html, html_path)
+                    pending[-1] = (doc, job)
+                    convert_done(wait=False)
+                convert_done(wait=True)
+        finally:
+            # the docx left unconverted by an error
+            for doc, _ in pending:
+                doc.__exit__(None, None, None)
+        return mails
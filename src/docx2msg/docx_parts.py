@@ -0,0 +1,282 @@
+import hashlib
+import posixpath
+from pathlib import Path
+from typing import IO, Dict, Iterator, Optional, Set, Tuple, Union
+from zipfile import ZipFile
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+NSMAP = {"w": W_NS}
+
+# relationship types of the main document part, transitional and strict
+OFFICE_DOCUMENT_REL_TYPES = {
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument",
+    "http://purl.oclc.org/ooxml/officeDocument/relationships/officeDocument",
+}
+DEFAULT_DOCUMENT_PART = "word/document.xml"
+# relationship types of the styles part, transitional and strict
+STYLES_REL_TYPES = {
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles",
+    "http://purl.oclc.org/ooxml/officeDocument/relationships/styles",
+}
+
+XML_PARSER = etree.XMLParser(resolve_entities=False)
+
+
+def w(tag: str) -> str:
+    """Return the Clark notation of a WordprocessingML tag."""
+    return f"{{{W_NS}}}{tag}"
+
+
+# text of the run children that python-docx renders in `Paragraph.text`
+RUN_CHILD_TEXT = {
+    w("tab"): "\t",
+    w("ptab"): "\t",
+    w("cr"): "\n",
+    w("noBreakHyphen"): "-",
+}
+
+
+def part_rels(docx: ZipFile, part_name: str) -> Iterator[Tuple[str, str, str]]:
+    """Yield the (id, type, target part name) of the relationships of `part_name`.
+
+    The package relationships are the ones of the part named "".
+    """
+    part_dir, part_file = posixpath.split(part_name)
+    rels = etree.fromstring(
+        docx.read(posixpath.join(part_dir, "_rels", f"{part_file}.rels")), XML_PARSER
+    )
+    for rel in rels.iterchildren(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(part_dir, target))
+        yield rel.get("Id"), rel.get("Type"), target
+
+
+def part_target(docx: ZipFile, part_name: str, r_id: str) -> Optional[str]:
+    """Resolve the relationship `r_id` of `part_name` to the name of the target part."""
+    for rel_id, _, target in part_rels(docx, part_name):
+        if rel_id == r_id:
+            return target
+    return None
+
+
+def document_part(docx: ZipFile) -> str:
+    """Return the name of the main document part, e.g. "word/document.xml"."""
+    for _, rel_type, target in part_rels(docx, ""):
+        if rel_type in OFFICE_DOCUMENT_REL_TYPES:
+            return target
+    return DEFAULT_DOCUMENT_PART
+
+
+def is_section_properties(sect_pr: etree._Element) -> bool:
+    """Return whether a `w:sectPr` defines a section, like python-docx's
+    `./w:p/w:pPr/w:sectPr | ./w:sectPr` of the body, rather than being e.g. the
+    former properties kept by a tracked `w:sectPrChange`.
+    """
+    parent = sect_pr.getparent()
+    if parent.tag == w("body"):
+        return True
+    if parent.tag != w("pPr"):
+        return False
+    p = parent.getparent()
+    return p is not None and p.tag == w("p") and p.getparent().tag == w("body")
+
+
+def first_header_part(docx: ZipFile) -> Optional[str]:
+    """Return the part name of the default header of the first section."""
+    part_name = document_part(docx)
+    with docx.open(part_name) as f:
+        # stop at the first section, dropping the body blocks passed on the way
+        for _, elem in etree.iterparse(
+            f, tag=(w("sectPr"), w("p"), w("tbl")), resolve_entities=False
+        ):
+            if elem.tag == w("sectPr"):
+                if not is_section_properties(elem):
+                    continue
+                for ref in elem.iterchildren(w("headerReference")):
+                    if ref.get(w("type")) == "default":
+                        r_id = ref.get(f"{{{R_NS}}}id")
+                        return part_target(docx, part_name, r_id)
+                return None
+            if elem.getparent().tag == w("body"):
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+    return None
+
+
+# body blocks, paragraph and run children which show nothing on their own
+EMPTY_BLOCK_TAGS = {w("sectPr"), w("bookmarkStart"), w("bookmarkEnd")}
+EMPTY_PARAGRAPH_CHILD_TAGS = {
+    w("bookmarkStart"),
+    w("bookmarkEnd"),
+    w("proofErr"),
+}
+EMPTY_RUN_CHILD_TAGS = {w("rPr"), w("lastRenderedPageBreak")}
+# paragraph properties which show something even on an empty paragraph,
+# e.g. the number of a list item or a bottom border drawn as a horizontal rule
+VISIBLE_PARAGRAPH_PROPERTY_TAGS = {w("numPr"), w("pBdr"), w("shd")}
+
+
+def shows_paragraph_properties(p_pr: etree._Element) -> bool:
+    """Return whether a `w:pPr` shows something even on an empty paragraph."""
+    return any(child.tag in VISIBLE_PARAGRAPH_PROPERTY_TAGS for child in p_pr)
+
+
+def is_empty_block(elem: etree._Element) -> bool:
+    """Return whether a child of `w:body` shows nothing, e.g. an empty paragraph.
+
+    The style of a paragraph is not resolved here, see `visible_paragraph_styles`.
+    """
+    if elem.tag in EMPTY_BLOCK_TAGS:
+        return True
+    if elem.tag != w("p"):
+        return False
+    for child in elem:
+        if child.tag == w("r"):
+            if any(c.tag not in EMPTY_RUN_CHILD_TAGS for c in child):
+                return False
+        elif child.tag == w("pPr"):
+            if shows_paragraph_properties(child):
+                return False
+        elif child.tag not in EMPTY_PARAGRAPH_CHILD_TAGS:
+            return False
+    return True
+
+
+def paragraph_style(p: etree._Element) -> Optional[str]:
+    """Return the style id of a `w:p`, None for the default paragraph style."""
+    p_style = p.find("w:pPr/w:pStyle", NSMAP)
+    return None if p_style is None else p_style.get(w("val"))
+
+
+def visible_paragraph_styles(docx: ZipFile, part_name: str) -> Set[Optional[str]]:
+    """Return the ids of the paragraph styles which show something even on an empty
+    paragraph, e.g. list styles, including None if the default paragraph style does.
+    """
+    styles_part = None
+    for _, rel_type, target in part_rels(docx, part_name):
+        if rel_type in STYLES_REL_TYPES:
+            styles_part = target
+            break
+    if styles_part is None:
+        return set()
+    styles = etree.fromstring(docx.read(styles_part), XML_PARSER)
+    based_on: Dict[str, str] = {}
+    visible = set()
+    default = None
+    for style in styles.iterchildren(w("style")):
+        if style.get(w("type")) != "paragraph":
+            continue
+        style_id = style.get(w("styleId"))
+        if style.get(w("default")) in ("1", "true", "on"):
+            default = style_id
+        p_pr = style.find(w("pPr"))
+        if p_pr is not None and shows_paragraph_properties(p_pr):
+            visible.add(style_id)
+        parent = style.find(w("basedOn"))
+        if parent is not None:
+            based_on[style_id] = parent.get(w("val"))
+    # a style also shows what the styles it's based on show
+    for style_id in list(based_on):
+        chain = {style_id}
+        parent = based_on.get(style_id)
+        while parent is not None and parent not in chain:
+            if parent in visible:
+                visible.add(style_id)
+                break
+            chain.add(parent)
+            parent = based_on.get(parent)
+    if default in visible:
+        visible.add(None)
+    return visible
+
+
+def body_is_empty(docx_path: Union[str, Path]) -> bool:
+    """Return whether the body of a docx shows nothing, e.g. a docx only for the header.
+
+    The document part is streamed and the check stops at the first block with content.
+    """
+    with ZipFile(docx_path) as docx:
+        part_name = document_part(docx)
+        visible_styles = None
+        with docx.open(part_name) as f:
+            for _, elem in etree.iterparse(f, resolve_entities=False):
+                parent = elem.getparent()
+                if parent is None or parent.tag != w("body"):
+                    continue
+                if not is_empty_block(elem):
+                    return False
+                if elem.tag == w("p"):
+                    # the styles are only read once an empty paragraph is met
+                    if visible_styles is None:
+                        visible_styles = visible_paragraph_styles(docx, part_name)
+                    if paragraph_style(elem) in visible_styles:
+                        return False
+                elem.clear()
+    return True
+
+
+_TEXT_CHILDREN = " or ".join(
+    f"self::w:{tag}" for tag in ("t", "tab", "ptab", "br", "cr", "noBreakHyphen")
+)
+# the run children rendered as text, compiled once and returned in document order
+RUN_TEXT_XPATH = etree.XPath(
+    f"./w:r/*[{_TEXT_CHILDREN}] | ./w:hyperlink/w:r/*[{_TEXT_CHILDREN}]",
+    namespaces=NSMAP,
+)
+
+
+def run_child_text(child: etree._Element) -> str:
+    if child.tag == w("t"):
+        return child.text or ""
+    if child.tag == w("br"):
+        return "\n" if child.get(w("type"), "textWrapping") == "textWrapping" else ""
+    return RUN_CHILD_TEXT[child.tag]
+
+
+def paragraph_text(p: etree._Element) -> str:
+    """Return the text of a `w:p` element the way python-docx's `Paragraph.text` does."""
+    return "".join(run_child_text(child) for child in RUN_TEXT_XPATH(p))
+
+
+def iter_header_texts(f: IO[bytes]) -> Iterator[str]:
+    """Yield the text of each top-level paragraph of a header part, freeing it once read."""
+    for _, p in etree.iterparse(f, tag=w("p"), resolve_entities=False):
+        if p.getparent().tag == w("hdr"):
+            yield paragraph_text(p)
+            p.clear()
+
+
+def read_header_text(docx_path: Union[str, Path]) -> str:
+    """Read the text of the header of the first section of a docx.
+
+    Only the document and header parts are streamed from the package, instead
+    of loading the whole document with python-docx.
+    """
+    with ZipFile(docx_path) as docx:
+        header_part = first_header_part(docx)
+        if header_part is None:
+            return ""
+        with docx.open(header_part) as f:
+            return "\n".join(iter_header_texts(f))
+
+
+def package_fingerprint(docx_path: Union[str, Path]) -> str:
+    """Return a digest of the names, CRC-32s and sizes of the parts of a docx.
+
+    Unlike a hash of the file, it doesn't change when the same content is saved
+    again with new zip timestamps, e.g. a template rendered with the same context,
+    and no part has to be decompressed.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with ZipFile(docx_path) as docx:
+        for info in docx.infolist():
+            digest.update(f"{info.filename}\0{info.CRC}\0{info.file_size}\n".encode())
+    return digest.hexdigest()
@@ -1,18 +1,28 @@
 from datetime import datetime
 from enum import IntEnum
-from typing import Any, Callable, Dict, List, Type, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Type, Union
 
 from win32com.client import CDispatch
 
 
 def OnlyTypeSet(k: str, T: Type, parser: Callable[[Any], Any] = None):
-    def __set_attr(mail: object, val: T, **kwargs):
-        if isinstance(val, T):
-            if parser:
-                val = parser(val)
-            setattr(mail, k, val)
-        else:
-            raise ValueError(f"This mail property must be a {T}, not {type(val)}")
+    # the exact type check short-circuits the isinstance call for plain values
+    if parser is None:
+
+        def __set_attr(mail: object, val: T, **kwargs):
+            if type(val) is T or isinstance(val, T):
+                setattr(mail, k, val)
+            else:
+                raise ValueError(f"This mail property must be a {T}, not {type(val)}")
+
+    else:
+
+        def __set_attr(mail: object, val: T, **kwargs):
+            if type(val) is T or isinstance(val, T):
+                setattr(mail, k, parser(val))
+            else:
+                raise ValueError(f"This mail property must be a {T}, not {type(val)}")
 
     return __set_attr
 
@@ -58,13 +68,15 @@ def StrListSet(attr: str):
     return __set_attr
 
 
-def AttrsAdd(attr: str):
+def AttrsAdd(attr: str, *add_args: Any):
     def __set_attr(mail: object, items: Union[str, List[str]], **kwargs):
         if isinstance(items, str):
             items = items.split(";")
         if isinstance(items, List):
+            # get the collection once, not by a COM call per item
+            collection = getattr(mail, attr)
             for item in items:
-                getattr(mail, attr).Add(item)
+                collection.Add(item, *add_args)
         else:
             raise ValueError(
                 f"This mail property must be a string or a List of string , not {type(items)}"
@@ -77,14 +89,34 @@ def parse_datetime(val: datetime):
     return f"{val:%Y-%m-%d %H:%M}"
 
 
-def set_save_sent_folder(mail: object, path: str, outlook: CDispatch, **kwargs):
-    folder = outlook.Session
+@lru_cache(maxsize=64)
+def split_folder_path(path: str) -> Tuple[Union[int, str], ...]:
+    folder_names = []
     for folder_name in path.split("/"):
         try:
             folder_name = int(folder_name)
         except ValueError:
             pass
-        folder = folder.Folders[folder_name]
+        folder_names.append(folder_name)
+    return tuple(folder_names)
+
+
+def set_save_sent_folder(
+    mail: object,
+    path: str,
+    outlook: CDispatch,
+    folders: Dict[str, CDispatch] = None,
+    **kwargs,
+):
+    # `folders` caches the folders resolved by the same outlook, since walking
+    # the path takes a COM call per segment
+    folder = folders.get(path) if folders is not None else None
+    if folder is None:
+        folder = outlook.Session
+        for folder_name in split_folder_path(path):
+            folder = folder.Folders[folder_name]
+        if folders is not None:
+            folders[path] = folder
     mail.SaveSentMessageFolder = folder
 
 
@@ -99,7 +131,8 @@ TYPED_PROPERTIES = {
 MAILADDRESS_PROPERTIES = {"To", "CC", "BCC"}
 DATETIME_PROPERTIES = {"DeferredDeliveryTime", "ExpiryTime", "FlagDueBy"}
 SPECIAL_PROPERTIES = {
-    "Attachments": AttrsAdd("Attachments"),
+    # olByValue, passed explicitly so the default isn't marshalled as a missing arg
+    "Attachments": AttrsAdd("Attachments", 1),
     "ReplyRecipients": AttrsAdd("ReplyRecipients"),
     "Importance": StrIntEnumSet(Importance),
     "Sensitivity": StrIntEnumSet(Sensitivity),
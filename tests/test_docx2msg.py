@@ -0,0 +1,151 @@
+import io
+
+import pytest
+from docx import Document
+from docxtpl import DocxTemplate
+
+pytest.importorskip("win32com.client")
+
+import docx2msg
+from docx2msg import Docx2Msg, clear_html_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_html_cache():
+    clear_html_cache()
+    yield
+    clear_html_cache()
+
+
+def cache(key, html):
+    return docx2msg._cached_html((key, "word"), lambda: html)
+
+
+def cached_keys():
+    return [key for key, _ in docx2msg._HTML_CACHE]
+
+
+def test_cached_html_converts_once():
+    calls = []
+
+    def convert():
+        calls.append(1)
+        return "<html>a</html>"
+
+    assert docx2msg._cached_html(("a", "word"), convert) == "<html>a</html>"
+    assert docx2msg._cached_html(("a", "word"), convert) == "<html>a</html>"
+    assert len(calls) == 1
+    assert docx2msg._get_cached_html(("a", "mammoth")) is None
+
+
+def test_cached_html_evicts_least_recently_used_entry(monkeypatch):
+    monkeypatch.setattr(docx2msg, "_HTML_CACHE_SIZE", 2)
+    cache("a", "1")
+    cache("b", "2")
+    docx2msg._get_cached_html(("a", "word"))
+    cache("c", "3")
+
+    assert cached_keys() == ["a", "c"]
+
+
+def test_cached_html_evicts_by_total_chars(monkeypatch):
+    monkeypatch.setattr(docx2msg, "_HTML_CACHE_MAX_CHARS", 10)
+    cache("a", "12345")
+    cache("b", "1234")
+    cache("c", "123")
+
+    assert cached_keys() == ["b", "c"]
+    assert docx2msg._HTML_CACHE_CHARS == 7
+
+
+def test_cached_html_skips_oversize_html(monkeypatch):
+    monkeypatch.setattr(docx2msg, "_HTML_CACHE_MAX_CHARS", 10)
+    cache("a", "123")
+
+    assert cache("big", "x" * 11) == "x" * 11
+    assert cached_keys() == ["a"]
+    assert docx2msg._HTML_CACHE_CHARS == 3
+
+
+def test_clear_html_cache():
+    cache("a", "123")
+    clear_html_cache()
+
+    assert not docx2msg._HTML_CACHE
+    assert docx2msg._HTML_CACHE_CHARS == 0
+    assert docx2msg._get_cached_html(("a", "word")) is None
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Subject: {{ subject }}"
+    doc.add_paragraph("Hello {{ name }}")
+    path = tmp_path / "template.docx"
+    doc.save(path)
+    return path
+
+
+def test_template_changed_untouched(template_path):
+    assert not docx2msg._template_changed(DocxTemplate(template_path))
+
+
+def test_template_changed_rendered(template_path):
+    template = DocxTemplate(template_path)
+    template.render({"subject": "Demo", "name": "you"})
+
+    assert docx2msg._template_changed(template)
+
+
+def test_template_changed_replacement_only(template_path):
+    template = DocxTemplate(template_path)
+    template.replace_pic("image1.png", io.BytesIO(b"png"))
+
+    assert docx2msg._template_changed(template)
+
+
+WORD_HTML = (
+    '<html xmlns:o="urn:schemas-microsoft-com:office:office">\n'
+    "<head>\n"
+    '<meta http-equiv=Content-Type content="text/html; charset=utf-8">\n'
+    "</head>\n"
+    '<body><p>Hé</p><img src="temp.files/image001.png"><img src="missing.png"></body>\n'
+    "</html>"
+)
+
+
+@pytest.fixture
+def read_html(template_path):
+    # no COM is used to read an exported HTML
+    with Docx2Msg(template_path, outlook=object(), word=object()) as doc:
+        (doc.temp_dir / "temp.files").mkdir()
+        (doc.temp_dir / "temp.files" / "image001.png").write_bytes(b"png")
+
+        def read(prolog=""):
+            html_path = doc.temp_dir / "temp.html"
+            html_path.write_bytes((prolog + WORD_HTML).encode("utf-8"))
+            return doc._Docx2Msg__read_html(html_path)
+
+        yield read
+
+
+def test_read_html_keeps_meta_charset(read_html):
+    html = read_html()
+
+    assert '<meta http-equiv="Content-Type" content="text/html; charset=utf-8">' in html
+    assert "<p>Hé</p>" in html
+
+
+def test_read_html_without_doctype(read_html):
+    assert read_html().startswith("<html")
+
+
+def test_read_html_keeps_word_doctype(read_html):
+    assert read_html("<!DOCTYPE html>\n").startswith("<!DOCTYPE html>\n<html")
+
+
+def test_read_html_inlines_images(read_html):
+    html = read_html()
+
+    assert '<img src="data:image/png;base64,cG5n">' in html
+    assert '<img src="missing.png">' in html
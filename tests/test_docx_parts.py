@@ -0,0 +1,169 @@
+import copy
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.opc.packuri import PackURI
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from docx2msg.docx_parts import body_is_empty, package_fingerprint, read_header_text
+
+
+def python_docx_header_text(path):
+    header = Document(path).sections[0].header
+    return "\n".join(p.text for p in header.paragraphs)
+
+
+def save(doc, tmp_path, name="test.docx"):
+    path = tmp_path / name
+    doc.save(path)
+    return path
+
+
+def test_header_lines(tmp_path):
+    doc = Document()
+    header = doc.sections[0].header
+    header.paragraphs[0].text = "Subject: Demo email"
+    header.add_paragraph("To: anyone@example.com")
+    header.add_paragraph("")
+    header.add_paragraph("CC: p1@example.com;p2@example.com")
+    path = save(doc, tmp_path)
+
+    assert read_header_text(path) == python_docx_header_text(path)
+    assert read_header_text(path).startswith("Subject: Demo email\nTo: ")
+
+
+def test_no_header(tmp_path):
+    doc = Document()
+    doc.add_paragraph("body")
+    path = save(doc, tmp_path)
+
+    assert read_header_text(path) == python_docx_header_text(path) == ""
+
+
+def test_multi_section_reads_first_section(tmp_path):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Subject: first"
+    doc.add_paragraph("first section")
+    second = doc.add_section()
+    second.header.is_linked_to_previous = False
+    second.header.paragraphs[0].text = "Subject: second"
+    doc.add_paragraph("second section")
+    path = save(doc, tmp_path)
+
+    assert read_header_text(path) == python_docx_header_text(path)
+    assert read_header_text(path) == "Subject: first"
+
+
+def test_multi_section_first_without_header(tmp_path):
+    doc = Document()
+    doc.add_paragraph("first section")
+    second = doc.add_section()
+    second.header.is_linked_to_previous = False
+    second.header.paragraphs[0].text = "Subject: second"
+    path = save(doc, tmp_path)
+
+    assert read_header_text(path) == python_docx_header_text(path) == ""
+
+
+def test_tabs_breaks_and_hyperlinks(tmp_path):
+    doc = Document()
+    p = doc.sections[0].header.paragraphs[0]
+    run = p.add_run("Subject:")
+    run.add_tab()
+    run.add_text("Demo")
+    run.add_break()
+    run.add_text("To: anyone@example.com")
+    run.add_break(WD_BREAK.PAGE)
+    p._p.append(
+        parse_xml(
+            f'<w:hyperlink {nsdecls("w", "r")} r:id="rId99">'
+            "<w:r><w:t>CC: p1@example.com</w:t></w:r>"
+            "<w:r><w:noBreakHyphen/><w:cr/><w:t>BCC: p2@example.com</w:t></w:r>"
+            "</w:hyperlink>"
+        )
+    )
+    path = save(doc, tmp_path)
+
+    assert read_header_text(path) == python_docx_header_text(path)
+    assert "\t" in read_header_text(path)
+    assert "CC: p1@example.com" in read_header_text(path)
+
+
+def test_tracked_section_change(tmp_path):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Subject: tracked"
+    sect_pr = doc.sections[0]._sectPr
+    former = copy.deepcopy(sect_pr)
+    for ref in former.findall(former.tag.replace("sectPr", "headerReference")):
+        former.remove(ref)
+    change = parse_xml(
+        f'<w:sectPrChange {nsdecls("w")} w:id="1" w:author="a" '
+        'w:date="2024-01-01T00:00:00Z"/>'
+    )
+    change.append(former)
+    sect_pr.append(change)
+    path = save(doc, tmp_path)
+
+    assert read_header_text(path) == python_docx_header_text(path)
+    assert read_header_text(path) == "Subject: tracked"
+
+
+def test_document_part_from_package_rels(tmp_path):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Subject: document2"
+    doc.add_paragraph("body")
+    doc.part.partname = PackURI("/word/document2.xml")
+    path = save(doc, tmp_path)
+
+    assert read_header_text(path) == python_docx_header_text(path)
+    assert read_header_text(path) == "Subject: document2"
+    assert not body_is_empty(path)
+
+
+@pytest.mark.parametrize(
+    "paragraphs, style, p_pr, expected",
+    [
+        ([], None, None, True),
+        ([""], None, None, True),
+        (["", "body"], None, None, False),
+        ([""], None, '<w:jc w:val="center"/>', True),
+        # Word renders the number of an empty list item
+        ([""], "List Number", None, False),
+        ([""], None, '<w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr>', False),
+        # a bottom border is a horizontal rule
+        (
+            [""],
+            None,
+            '<w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="auto"/>'
+            "</w:pBdr>",
+            False,
+        ),
+        ([""], None, '<w:shd w:val="clear" w:color="auto" w:fill="FFFF00"/>', False),
+    ],
+)
+def test_body_is_empty(tmp_path, paragraphs, style, p_pr, expected):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Subject: Demo email"
+    for text in paragraphs:
+        p = doc.add_paragraph(text, style=style)
+        if p_pr is not None:
+            p._p.get_or_add_pPr().append(
+                parse_xml(f'<w:pPr {nsdecls("w")}>{p_pr}</w:pPr>')[0]
+            )
+    path = save(doc, tmp_path)
+
+    assert body_is_empty(path) is expected
+
+
+def test_package_fingerprint(tmp_path):
+    doc = Document()
+    doc.add_paragraph("body")
+    first = save(doc, tmp_path, "first.docx")
+    again = save(doc, tmp_path, "again.docx")
+    doc.add_paragraph("more")
+    changed = save(doc, tmp_path, "changed.docx")
+
+    assert package_fingerprint(first) == package_fingerprint(again)
+    assert package_fingerprint(first) != package_fingerprint(changed)